@@ -1,4 +1,5 @@
 import numpy as np
+from scipy.stats import binom
 from .base import OptionPricingModel, OPTION_TYPE
 
 
@@ -17,6 +18,9 @@ class BinomialTreeModel(OptionPricingModel):
         risk_free_rate (float): Constant risk-free interest rate, expressed as a decimal (e.g., 0.05 for 5%).
         sigma (float): Volatility of the underlying asset (standard deviation of log returns).
         number_of_time_steps (int): Number of time periods between the valuation date and the exercise date.
+
+        Raises:
+        ValueError: If the tree is degenerate, i.e. has no up or down moves or risk-neutral probabilities outside [0, 1].
         """
         self.S = underlying_spot_price
         self.K = strike_price
@@ -27,16 +31,24 @@ class BinomialTreeModel(OptionPricingModel):
 
         # Precompute constants
         self.dT = self.T / self.N
-        self.u = np.exp(self.sigma * np.sqrt(self.dT))
+        self.log_u = self.sigma * np.sqrt(self.dT)
+        if not self.log_u > 0:
+            raise ValueError("Invalid binomial tree. Volatility and days to maturity must be positive.")
+        self.u = np.exp(self.log_u)
         self.d = 1.0 / self.u
         self.a = np.exp(self.r * self.dT)
         self.p = (self.a - self.d) / (self.u - self.d)
         self.q = 1.0 - self.p
-        self.discount = np.exp(-self.r * self.dT)
+        if not 0.0 <= self.p <= 1.0:
+            raise ValueError("Invalid binomial tree. The risk-free growth over a time step must lie between a down "
+                             "and an up move, increase the volatility or the number of time steps.")
 
     def calculate_option_price(self, option_type):
         """
         Calculates the price of a European call or put option using the Binomial Tree model.
+        Rolling a European payoff back through the tree telescopes into a single sum over the terminal nodes,
+        which is evaluated directly in O(N) time instead of by O(N^2) backward induction:
+            V_0 = e^(-rT) * sum_j C(N, j) * p^(N - j) * q^j * payoff(S_T[j])
 
         Parameters:
         option_type (OPTION_TYPE): The type of option to price. Must be OPTION_TYPE.CALL_OPTION
@@ -55,15 +67,19 @@ class BinomialTreeModel(OptionPricingModel):
         else:
             raise ValueError("Invalid option type. Must be OPTION_TYPE.CALL_OPTION or OPTION_TYPE.PUT_OPTION.")
 
-        # Initialise asset prices at maturity
-        j = np.arange(self.N + 1)
-        S_T = self.S * self.u ** (self.N - j) * self.d ** j
-
-        # Calculate option values at maturity
-        V = payoff_function(S_T)
+        # Restrict the sum to the terminal nodes where the option ends in the money, node j being reached by
+        # j down moves. Since S_T[j] = S * exp((N - 2j) * ln(u)), S_T[j] > K exactly when j < j_star:
+        # j_star = [N * ln(u) - ln(K / S)] / (2 * ln(u))
+        j_star = (self.N * self.log_u - np.log(self.K / self.S)) / (2 * self.log_u)
+        j_star = int(np.clip(np.ceil(j_star), 0, self.N + 1))
+        if option_type == OPTION_TYPE.CALL_OPTION:
+            j = np.arange(j_star)
+        else:
+            j = np.arange(j_star, self.N + 1)
 
-        # Perform backward induction
-        for _ in range(self.N):
-            V = self.discount * (self.p * V[:-1] + self.q * V[1:])
+        # Asset prices at maturity, using u^(N - j) * d^j = exp((N - 2j) * ln(u)) since d = 1 / u
+        S_T = self.S * np.exp(self.log_u * (self.N - 2 * j))
 
-        return V[0]
\ No newline at end of file
+        # Weight each payoff by the risk-neutral probability of reaching its node, C(N, j) * p^(N - j) * q^j
+        probabilities = binom.pmf(j, self.N, self.q)
+        return float(np.exp(-self.r * self.T) * np.dot(probabilities, payoff_function(S_T)))
@@ -1,11 +1,24 @@
+import math
 import numpy as np
-from scipy.stats import norm
+from scipy.special import ndtr
 from .base import OptionPricingModel
 from .base import OPTION_TYPE
 
+
+def _norm_cdf(x):
+    """
+    Standard normal cumulative distribution function for a scalar, evaluated with the C library's erfc.
+        Formula:
+        N(x) = 0.5 * erfc(-x / sqrt(2))
+    """
+    return 0.5 * math.erfc(-x * 0.7071067811865476)
+
+
 class BlackScholesModel(OptionPricingModel):
     """
     Class implementing calculation for European option price using the Black-Scholes formula.
+    Any of the inputs may be an array, in which case they are broadcast against each other and a whole grid of
+    option prices (e.g. a strike ladder or volatility surface) is calculated with vectorised NumPy operations.
     """
 
     def __init__(self, underlying_spot_price, strike_price, days_to_maturity, risk_free_rate, sigma):
@@ -13,19 +26,30 @@ class BlackScholesModel(OptionPricingModel):
         Initialises variables used in the Black-Scholes option pricing model.
 
         Parameters:
-        underlying_spot_price (float): The current price of the underlying asset.
-        strike_price (float): The strike price of the option.
-        days_to_maturity (int): The number of days until the option's maturity or expiration.
-        risk_free_rate (float): The risk-free interest rate, expressed as a decimal (e.g., 0.05 for 5%).
-        sigma (float): The volatility of the underlying asset, represented as the standard deviation of its returns.
-        """
-        self.S = underlying_spot_price
-        self.K = strike_price
+        underlying_spot_price (float or array_like): The current price of the underlying asset.
+        strike_price (float or array_like): The strike price of the option.
+        days_to_maturity (int or array_like): The number of days until the option's maturity or expiration.
+        risk_free_rate (float or array_like): The risk-free interest rate, expressed as a decimal (e.g., 0.05 for 5%).
+        sigma (float or array_like): The volatility of the underlying asset, represented as the standard deviation of its returns.
+        """
+        inputs = (underlying_spot_price, strike_price, days_to_maturity, risk_free_rate, sigma)
+        # Scalars are priced with the math module, which avoids NumPy's per-call overhead. Degenerate scalars (zero
+        # volatility or maturity, non-positive prices) are priced with NumPy, whose inf and nan limits give the
+        # correct prices where the math module would raise instead.
+        scalar = all(isinstance(value, (int, float)) for value in inputs)
+        self.vectorised = not (scalar and underlying_spot_price > 0 and strike_price > 0 and days_to_maturity > 0
+                               and sigma > 0)
+        if self.vectorised:
+            inputs = [np.asarray(value, dtype=float) for value in inputs]
+            self._math, self._norm_cdf = np, ndtr
+        else:
+            self._math, self._norm_cdf = math, _norm_cdf
+
+        self.S, self.K, days_to_maturity, self.r, self.sigma = inputs
         self.T = days_to_maturity / 365
-        self.r = risk_free_rate
-        self.sigma = sigma
 
-        # Precompute d1 and d2
+        # Precompute the discounted strike, d1 and d2
+        self.discounted_strike = self.K * self._math.exp(-self.r * self.T)
         self._compute_d1_d2()
 
     def _compute_d1_d2(self):
@@ -35,9 +59,9 @@ class BlackScholesModel(OptionPricingModel):
             d1 = [ln(S / K) + (r + 0.5 * sigma^2) * T] / (sigma * sqrt(T))
             d2 = d1 - sigma * sqrt(T)
         """
-        sqrt_T = np.sqrt(self.T)
+        sqrt_T = self._math.sqrt(self.T)
         sigma_sqrt_T = self.sigma * sqrt_T
-        log_SK = np.log(self.S / self.K)
+        log_SK = self._math.log(self.S / self.K)
         self.d1 = (log_SK + (self.r + 0.5 * self.sigma ** 2) * self.T) / sigma_sqrt_T
         self.d2 = self.d1 - sigma_sqrt_T
 
@@ -49,15 +73,43 @@ class BlackScholesModel(OptionPricingModel):
         option_type (OPTION_TYPE): The type of option, either OPTION_TYPE.CALL_OPTION or OPTION_TYPE.PUT_OPTION.
 
         Returns:
-        float: The calculated price of the option.
+        float or numpy.ndarray: The calculated price of the option, broadcast to the shape of the inputs.
 
         Raises:
         ValueError: If an invalid option type is provided.
         """
         if option_type == OPTION_TYPE.CALL_OPTION:
-            price = (self.S * norm.cdf(self.d1) - self.K * np.exp(-self.r * self.T) * norm.cdf(self.d2))
+            price = (self.S * self._norm_cdf(self.d1) - self.discounted_strike * self._norm_cdf(self.d2))
         elif option_type == OPTION_TYPE.PUT_OPTION:
-            price = (self.K * np.exp(-self.r * self.T) * norm.cdf(-self.d2) - self.S * norm.cdf(-self.d1))
+            price = (self.discounted_strike * self._norm_cdf(-self.d2) - self.S * self._norm_cdf(-self.d1))
         else:
             raise ValueError("Invalid option type. Must be OPTION_TYPE.CALL_OPTION or OPTION_TYPE.PUT_OPTION.")
         return price
+
+    def _cdf_and_complement(self, x):
+        """
+        Evaluates N(x) and N(-x) with a single evaluation of the normal CDF. The CDF is only evaluated at -|x|, where
+        the tail is small and accurate, and the other value is taken as its complement, 1 - N(-|x|).
+        """
+        tail = self._norm_cdf(-abs(x))
+        complement = 1 - tail
+        if self.vectorised:
+            return np.where(x > 0, complement, tail), np.where(x > 0, tail, complement)
+        return (complement, tail) if x > 0 else (tail, complement)
+
+    def price_both(self):
+        """
+        Calculates both the call and the put price, evaluating the normal CDF of d1 and d2 only once.
+            Since N(-x) = 1 - N(x):
+            call = S * N(d1) - K * exp(-rT) * N(d2)
+            put = K * exp(-rT) * N(-d2) - S * N(-d1)
+        Each complement is taken of the smaller tail, so deep in- or out-of-the-money prices keep their precision.
+
+        Returns:
+        tuple: The call and put prices, each a float or numpy.ndarray broadcast to the shape of the inputs.
+        """
+        N_d1, N_minus_d1 = self._cdf_and_complement(self.d1)
+        N_d2, N_minus_d2 = self._cdf_and_complement(self.d2)
+        call_price = self.S * N_d1 - self.discounted_strike * N_d2
+        put_price = self.discounted_strike * N_minus_d2 - self.S * N_minus_d1
+        return call_price, put_price
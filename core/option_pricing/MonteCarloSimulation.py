@@ -1,7 +1,150 @@
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
+import numexpr as ne
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 from .base import OptionPricingModel, OPTION_TYPE
 
+try:
+    from ._montecarlo_numba import gbm_paths
+except ImportError:  # Numba is optional, fall back to the NumPy implementation
+    gbm_paths = None
+
+try:
+    import cupy as cp
+except ImportError:  # CuPy is optional, simulations run on the CPU without it
+    cp = None
+
+# Number of samples used to estimate the control variate coefficient.
+CONTROL_VARIATE_WARMUP = 1000
+
+# Random draws are generated and reduced in blocks of this size, each drawn from its own stream spawned from the
+# seed. Blocks are processed in parallel, and as they do not depend on the number of threads, the draws and the
+# partial sums combined from them are reproducible. Small enough for the app's 50,000 antithetic draws to span
+# several blocks, while creating each block's stream stays a small fraction of drawing it.
+BLOCK_SIZE = 1 << 14
+
+# Precision price paths and their random draws are stored in. Monte Carlo error is far larger than single precision
+# rounding, and halving the memory of a (simulations x time steps) matrix halves the bandwidth spent on it.
+PATH_DTYPE = np.float32
+
+
+def _blocks(out, seed_sequence=None):
+    """
+    Splits out into blocks of BLOCK_SIZE elements, each paired with its own random stream.
+
+    Parameters:
+    out (numpy.ndarray): C-contiguous array to split.
+    seed_sequence (numpy.random.SeedSequence, optional): Seed sequence the per-block streams are spawned from.
+                                                         If None, the blocks are paired with None.
+
+    Returns:
+    list: (block, numpy.random.Generator or None) pairs, the blocks being views of out.
+    """
+    flat = out.reshape(-1)
+    blocks = [flat[start:start + BLOCK_SIZE] for start in range(0, flat.size, BLOCK_SIZE)]
+    if seed_sequence is None:
+        return [(block, None) for block in blocks]
+    streams = [np.random.Generator(np.random.PCG64(child)) for child in seed_sequence.spawn(len(blocks))]
+    return list(zip(blocks, streams))
+
+
+def _map_blocks(function, blocks):
+    """
+    Applies function to each (block, stream) pair on a thread pool, returning the results in block order.
+    NumPy's random generators and numexpr release the GIL, so the blocks are processed concurrently.
+    """
+    if len(blocks) == 1:
+        return [function(*blocks[0])]
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return list(executor.map(lambda block: function(*block), blocks))
+
+
+def _fill_standard_normal(seed_sequence, out):
+    """
+    Fills out with standard normal draws, splitting the work across threads.
+
+    Parameters:
+    seed_sequence (numpy.random.SeedSequence): Seed sequence the per-block streams are spawned from.
+    out (numpy.ndarray): C-contiguous float32 or float64 array to fill in place.
+    """
+    _map_blocks(lambda block, stream: stream.standard_normal(dtype=out.dtype, out=block),
+                _blocks(out, seed_sequence))
+
+
+def _antithetic(expression):
+    """
+    Expands an expression in a signed standard normal draw {z} into the sum over the antithetic pair of draws
+    Z and -Z, so both halves are evaluated in a single numexpr pass.
+    """
+    return ' + '.join(expression.format(z=z) for z in ('Z', '(-Z)'))
+
+
+# Payoffs of the antithetic draws as (condition, value) templates, the payoff being the value where the condition
+# holds and zero elsewhere. They are rendered into numexpr expressions and, on a CUDA device, into reduction kernels,
+# so both evaluate the same formulas. numexpr does not eliminate common subexpressions, so rather than comparing the
+# log terminal price log_drift + vol * z against log_K, the draw is compared against the equivalent threshold
+# z_K = (log_K - log_drift) / vol. Each log terminal price is then evaluated once, inside exp(), which only
+# contributes to in-the-money payoffs.
+ANTITHETIC_PAYOFFS = {
+    OPTION_TYPE.CALL_OPTION: ('{z} > z_K', 'exp(log_drift + vol * {z}) - K'),
+    OPTION_TYPE.PUT_OPTION: ('{z} < z_K', 'K - exp(log_drift + vol * {z})'),
+}
+ANTITHETIC_TERMINAL_PRICE = 'exp(log_drift + vol * {z})'
+
+# Fused numexpr expressions over the standard normal draws Z, whose terminal prices are never stored.
+ANTITHETIC_PAYOFF_EXPRESSIONS = {option_type: _antithetic(f'where({condition}, {value}, 0.0)')
+                                 for option_type, (condition, value) in ANTITHETIC_PAYOFFS.items()}
+ANTITHETIC_TERMINAL_PRICE_EXPRESSION = _antithetic(ANTITHETIC_TERMINAL_PRICE)
+
+# Smallest number of simulations priced on a CUDA device, below which kernel launches and transfers cost more
+# than the simulation itself.
+GPU_MIN_SIMULATIONS = 100_000
+
+
+@functools.lru_cache(maxsize=None)
+def _cuda_device_available():
+    """
+    Returns True if CuPy is installed and a CUDA device can be used. The device is only probed on first use,
+    so importing the package does not initialise the CUDA runtime.
+    """
+    if cp is None:
+        return False
+    try:
+        return cp.cuda.runtime.getDeviceCount() > 0
+    except cp.cuda.runtime.CUDARuntimeError:
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def _gpu_sum_kernels():
+    """
+    Builds the CUDA reductions summing the antithetic terminal prices and payoffs over the draws Z in a single
+    pass, rendered from the same templates as the numexpr expressions. Only called once a device is available.
+
+    Returns:
+    tuple: The kernel summing the terminal prices and a dictionary of the kernel summing the payoffs for each
+           option type, each called with the draws Z followed by the scalars log_drift, vol, z_K and K.
+    """
+    def antithetic_sum_kernel(expression, name):
+        return cp.ReductionKernel('T Z, T log_drift, T vol, T z_K, T K', 'T total', _antithetic(expression),
+                                  'a + b', 'total = a', '0', name)
+
+    payoff_sums = {option_type: antithetic_sum_kernel(f'({condition} ? {value} : 0.0)',
+                                                      f'{option_type.name.lower()}_sum')
+                   for option_type, (condition, value) in ANTITHETIC_PAYOFFS.items()}
+    return antithetic_sum_kernel(ANTITHETIC_TERMINAL_PRICE, 'terminal_price_sum'), payoff_sums
+
+
+# Payoff expressions over terminal prices S_T that have already been simulated, e.g. as the end of price paths.
+TERMINAL_PAYOFF_EXPRESSIONS = {
+    OPTION_TYPE.CALL_OPTION: 'where(S_T > K, S_T - K, 0.0)',
+    OPTION_TYPE.PUT_OPTION: 'where(S_T < K, K - S_T, 0.0)',
+}
+
 
 class MonteCarloPricing(OptionPricingModel):
     """
@@ -9,6 +152,12 @@ class MonteCarloPricing(OptionPricingModel):
     It simulates underlying asset prices at expiry using the geometric Brownian motion model.
     For the simulated prices at maturity, it calculates the payoffs, averages them, and discounts the final value.
     This value represents the option price.
+
+    Variance is reduced with antithetic variates (every draw Z is paired with -Z) and a control variate on the
+    terminal price, whose risk-neutral expectation S_0 * e^(rT) is known exactly.
+
+    If CuPy is installed and a CUDA device is available, terminal prices for large simulations are drawn and
+    reduced on the device. Price paths are always simulated on the CPU.
     """
 
     def __init__(self, underlying_spot_price, strike_price, days_to_maturity, risk_free_rate, sigma,
@@ -31,29 +180,129 @@ class MonteCarloPricing(OptionPricingModel):
         self.sigma = sigma
         self.N = number_of_simulations
 
-        # Seed for reproducibility
-        np.random.seed(20)
+        # Seed for reproducibility, independent of NumPy's global random state and of the number of threads
+        self.seed_sequence = np.random.SeedSequence(20)
 
         # Precompute constants
         self.discount_factor = np.exp(-self.r * self.T)
+        self.log_drift = np.log(self.S_0) + (self.r - 0.5 * self.sigma ** 2) * self.T
+        self.vol = self.sigma * np.sqrt(self.T)
+        self.log_K = np.log(self.K)
+        # Draws above z_K end in the money for a call, with an infinite threshold if the terminal price is certain
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.z_K = (self.log_K - self.log_drift) / self.vol
+        self.forward_price = self.S_0 * np.exp(self.r * self.T)
+
+        self.use_gpu = self.N >= GPU_MIN_SIMULATIONS and _cuda_device_available()
 
     def simulate_terminal_prices(self):
         """
         Simulates terminal prices directly for European options using geometric Brownian motion.
+        Only the standard normal draws are stored, half as many as the number of simulations since each draw
+        is used together with its antithetic counterpart. Terminal prices S_T = exp(log_drift +/- vol * Z)
+        are evaluated on the fly when the payoffs are reduced, and the payoffs of both option types are reduced
+        together with the terminal prices.
+        """
+        if self.use_gpu:
+            # Generate random standard normal variables on the device, seeded from the seed sequence
+            seed = int(self.seed_sequence.spawn(1)[0].generate_state(1, np.uint64)[0])
+            self.Z = cp.random.default_rng(seed).standard_normal((self.N + 1) // 2)
+            terminal_price_sum, payoff_sums = _gpu_sum_kernels()
+            S_T_sum = float(terminal_price_sum(self.Z, *self._kernel_args()))
+            payoff_sums = {option_type: float(payoff_sum(self.Z, *self._kernel_args()))
+                           for option_type, payoff_sum in payoff_sums.items()}
+        else:
+            # Draw each block of random standard normal variables and reduce it while it is still in cache
+            self.Z = np.empty((self.N + 1) // 2)
+            S_T_sum, payoff_sums = self._block_sums(ANTITHETIC_TERMINAL_PRICE_EXPRESSION,
+                                                    ANTITHETIC_PAYOFF_EXPRESSIONS, 'Z',
+                                                    _blocks(self.Z, self.seed_sequence))
+
+        # Sample means of the terminal prices, used as the control variate, and of the payoffs
+        self.S_T_mean = S_T_sum / (2 * self.Z.size)
+        self.payoff_means = {option_type: payoff_sum / (2 * self.Z.size)
+                             for option_type, payoff_sum in payoff_sums.items()}
+
+    def _block_sums(self, S_T_expression, payoff_expressions, name, blocks):
+        """
+        Sums the terminal prices and the payoffs over blocks of simulated samples in parallel. numexpr evaluates
+        sum() reductions on a single thread, so each block is reduced separately and the partial sums combined.
+
+        Parameters:
+        S_T_expression (str): numexpr expression for the terminal prices.
+        payoff_expressions (dict): numexpr payoff expression for each option type.
+        name (str): Name the expressions reference the samples by.
+        blocks (list): (block, stream) pairs from _blocks. Blocks with a stream are first filled with standard
+                       normal draws from it.
+
+        Returns:
+        tuple: The sum of the terminal prices and a dictionary of the sum of the payoffs for each option type.
+        """
+        expressions = [S_T_expression, *payoff_expressions.values()]
+
+        def reduce_block(block, stream):
+            if stream is not None:
+                stream.standard_normal(out=block)
+            local_dict = self._local_dict(**{name: block})
+            return [ne.evaluate(f'sum({expression})', local_dict=local_dict) for expression in expressions]
+
+        # Combine the partial sums in block order, so the result does not depend on the number of threads
+        S_T_sum, *payoff_sums = np.sum(_map_blocks(reduce_block, blocks), axis=0)
+        return float(S_T_sum), dict(zip(payoff_expressions, map(float, payoff_sums)))
+
+    def _local_dict(self, **arrays):
+        """Returns the variables referenced by the numexpr payoff and terminal price expressions."""
+        return dict(arrays, log_drift=self.log_drift, vol=self.vol, z_K=self.z_K, K=self.K)
+
+    def _kernel_args(self):
+        """Returns the scalar arguments of the CUDA reduction kernels, following the draws Z."""
+        return float(self.log_drift), float(self.vol), float(self.z_K), float(self.K)
+
+    def _simulated_samples(self, option_type):
         """
-        # Generate random standard normal variables
-        Z = np.random.standard_normal(self.N)
-        # Calculate terminal asset prices
-        self.S_T = self.S_0 * np.exp(
-            (self.r - 0.5 * self.sigma ** 2) * self.T + self.sigma * np.sqrt(self.T) * Z
-        )
+        Returns the simulated samples to price the option with, simulating terminal prices if required.
+        If price paths have been simulated but terminal prices have not, the last step of the paths is reused
+        rather than drawing another set of random variables.
+
+        Returns:
+        tuple: The payoff and terminal price expressions, the name and values of the simulated array they
+               reference, the mean payoff and the mean terminal price.
+        """
+        try:
+            self.Z
+        except AttributeError:
+            try:
+                # Reduce the terminal prices in double precision, whatever precision the paths are stored in
+                S_T = self.price_paths[:, -1].astype(np.float64)
+            except AttributeError:
+                self.simulate_terminal_prices()
+            else:
+                S_T_sum, payoff_sums = self._block_sums('S_T', TERMINAL_PAYOFF_EXPRESSIONS, 'S_T', _blocks(S_T))
+                return (TERMINAL_PAYOFF_EXPRESSIONS[option_type], 'S_T', 'S_T', S_T,
+                        payoff_sums[option_type] / S_T.size, S_T_sum / S_T.size)
+
+        return (ANTITHETIC_PAYOFF_EXPRESSIONS[option_type], ANTITHETIC_TERMINAL_PRICE_EXPRESSION, 'Z', self.Z,
+                self.payoff_means[option_type], self.S_T_mean)
+
+    def _control_variate_coefficient(self, payoff_expression, S_T_expression, local_dict):
+        """
+        Estimates the optimal control variate coefficient beta = Cov(payoff, S_T) / Var(S_T)
+        from a warm-up batch of the simulated samples.
+        """
+        payoffs = ne.evaluate(payoff_expression, local_dict=local_dict)
+        S_T = ne.evaluate(S_T_expression, local_dict=local_dict)
+        S_T_variance = np.var(S_T)
+        if S_T_variance == 0.0:
+            return 0.0
+        return float(np.mean((payoffs - payoffs.mean()) * (S_T - S_T.mean())) / S_T_variance)
 
     def calculate_option_price(self, option_type):
         """
         Calculates the price of a European call or put option using a Monte Carlo Simulation.
 
-        This method simulates the terminal stock prices if they haven't been simulated yet,
-        and then calculates the option price based on the specified option type.
+        This method simulates the terminal stock prices if they haven't been simulated yet, reusing the end of
+        the simulated price paths when those are available, and then calculates the option price based on the
+        specified option type.
 
         Parameters:
         option_type (OPTION_TYPE): The type of option to price. Must be OPTION_TYPE.CALL_OPTION
@@ -65,21 +314,21 @@ class MonteCarloPricing(OptionPricingModel):
         Raises:
         ValueError: If the provided option_type is not valid.
         """
-        try:
-            self.S_T
-        except AttributeError:
-            self.simulate_terminal_prices()
-
-        # Calculate payoffs
-        if option_type == OPTION_TYPE.CALL_OPTION:
-            payoffs = np.maximum(self.S_T - self.K, 0)
-        elif option_type == OPTION_TYPE.PUT_OPTION:
-            payoffs = np.maximum(self.K - self.S_T, 0)
-        else:
+        if option_type not in ANTITHETIC_PAYOFF_EXPRESSIONS:
             raise ValueError("Invalid option type. Must be OPTION_TYPE.CALL_OPTION or OPTION_TYPE.PUT_OPTION.")
 
+        payoff_expression, S_T_expression, name, samples, payoff_mean, S_T_mean = self._simulated_samples(option_type)
+
+        # Correct the mean payoff by the sampling error in the terminal prices, whose expectation is known
+        warmup = samples[:CONTROL_VARIATE_WARMUP]
+        if not isinstance(warmup, np.ndarray):
+            warmup = cp.asnumpy(warmup)
+        warmup_dict = self._local_dict(**{name: warmup})
+        beta = self._control_variate_coefficient(payoff_expression, S_T_expression, warmup_dict)
+        payoff_mean -= beta * (S_T_mean - self.forward_price)
+
         # Calculate the option price
-        option_price = self.discount_factor * np.mean(payoffs)
+        option_price = self.discount_factor * payoff_mean
         return option_price
 
     def simulate_price_paths(self, num_time_steps):
@@ -88,23 +337,40 @@ class MonteCarloPricing(OptionPricingModel):
 
         This method generates multiple simulated price paths using a geometric Brownian motion model,
         which can be useful for path-dependent options or for visualizing potential asset price trajectories.
+        The paths and their random draws are stored in PATH_DTYPE precision.
 
         Parameters:
         num_time_steps (int): The number of time steps in the simulation.
         """
         dt = self.T / num_time_steps
-        # Initialize price paths matrix: rows are time steps, columns are simulations
-        S = np.zeros((num_time_steps + 1, self.N))
-        S[0] = self.S_0
+        # Generate random standard normal variables for each simulation and time step
+        Z = np.empty((self.N, num_time_steps), dtype=PATH_DTYPE)
+        _fill_standard_normal(self.seed_sequence, Z)
+
+        if gbm_paths is not None:
+            # Initialize price paths matrix: rows are simulations, columns are time steps
+            S = np.empty((self.N, num_time_steps + 1), dtype=PATH_DTYPE)
+            # Pass plain floats so every caller shares the one compiled specialisation of the kernel
+            gbm_paths(float(self.S_0), float(self.r), float(self.sigma), float(dt), Z, S)
+            self.price_paths = S
+            return
+
+        # Initialize price paths matrix: rows are simulations, columns are time steps
+        S = np.zeros((self.N, num_time_steps + 1), dtype=PATH_DTYPE)
+        S[:, 0] = self.S_0
 
-        # Generate random standard normal variables for each time step and simulation
-        Z = np.random.standard_normal((num_time_steps, self.N))
+        # Hoist the per-step drift and volatility out of the loop. They are cast to the precision of the paths, as
+        # NumPy scalars of a wider type would promote every step's temporaries to it.
+        drift = PATH_DTYPE((self.r - 0.5 * self.sigma * self.sigma) * dt)
+        vol = PATH_DTYPE(self.sigma * np.sqrt(dt))
 
-        # Simulate the price paths
+        # Simulate the price paths, evaluating each step's growth factor in place in a single reused buffer
+        growth = np.empty(self.N, dtype=PATH_DTYPE)
         for t in range(1, num_time_steps + 1):
-            S[t] = S[t - 1] * np.exp(
-                (self.r - 0.5 * self.sigma ** 2) * dt + self.sigma * np.sqrt(dt) * Z[t - 1]
-            )
+            np.multiply(Z[:, t - 1], vol, out=growth)
+            growth += drift
+            np.exp(growth, out=growth)
+            np.multiply(S[:, t - 1], growth, out=S[:, t])
 
         self.price_paths = S
 
@@ -127,14 +393,34 @@ class MonteCarloPricing(OptionPricingModel):
         except AttributeError:
             self.simulate_price_paths(num_time_steps=252)  # Default to 252 steps (approx. trading days in a year)
 
+        return MonteCarloPricing.plot_price_paths(self.price_paths[:num_of_movements], self.K)
+
+    @staticmethod
+    def plot_price_paths(price_paths, strike_price):
+        """
+        Plots simulated price paths against the strike price.
+
+        Parameters:
+        price_paths (numpy.ndarray): Price paths to plot, of shape (number_of_paths, num_time_steps + 1).
+        strike_price (float): Strike price of the option contract.
+
+        Returns:
+        matplotlib.figure.Figure: The matplotlib figure object.
+        """
         fig, ax = plt.subplots(figsize=(12, 8))
 
-        ax.plot(self.price_paths[:, :num_of_movements])
-        ax.axhline(self.K, color='k', linestyle='--', label='Strike Price')
-        ax.set_xlim([0, self.price_paths.shape[0] - 1])
+        # Draw all paths as a single collection of (time step, price) polylines rather than one artist per path
+        segments = np.empty(price_paths.shape + (2,))
+        segments[..., 0] = np.arange(price_paths.shape[1])
+        segments[..., 1] = price_paths
+        ax.add_collection(LineCollection(segments, colors=plt.rcParams['axes.prop_cycle'].by_key()['color']))
+        ax.autoscale_view()
+
+        ax.axhline(strike_price, color='k', linestyle='--', label='Strike Price')
+        ax.set_xlim([0, price_paths.shape[1] - 1])
         ax.set_xlabel('Time Steps')
         ax.set_ylabel('Asset Price')
-        ax.set_title(f'First {num_of_movements} Simulated Price Paths')
+        ax.set_title(f'First {len(price_paths)} Simulated Price Paths')
         ax.legend(loc='best')
 
         # Return the figure object to be used in Streamlit
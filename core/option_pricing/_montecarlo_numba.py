@@ -0,0 +1,29 @@
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def gbm_paths(S0, r, sigma, dt, Z, out):
+    """
+    Simulates geometric Brownian motion price paths, one simulation per thread iteration.
+    Each path is stepped through time in a double precision register and stored contiguously, so every thread
+    reads and writes sequential memory and no intermediate arrays are allocated. Z and out may be single precision,
+    in which case only the stored values are rounded and rounding errors do not compound along the path.
+
+    Parameters:
+    S0 (float): Current spot price of the underlying asset.
+    r (float): Constant risk-free interest rate.
+    sigma (float): Volatility of the underlying asset.
+    dt (float): Length of a single time step, in years.
+    Z (numpy.ndarray): Standard normal draws of shape (number_of_simulations, num_time_steps).
+    out (numpy.ndarray): Price paths of shape (number_of_simulations, num_time_steps + 1), filled in place.
+    """
+    N, T = Z.shape
+    drift = (r - 0.5 * sigma * sigma) * dt
+    vol = sigma * np.sqrt(dt)
+    for n in prange(N):
+        s = S0
+        out[n, 0] = s
+        for t in range(T):
+            s *= np.exp(drift + vol * Z[n, t])
+            out[n, t + 1] = s
@@ -1,10 +1,24 @@
 # Standard library imports
 import datetime
+import functools
 import requests_cache
 import yfinance as yf
 import matplotlib.pyplot as plt
 
 
+@functools.lru_cache(maxsize=None)
+def _cached_session(cache_days):
+    """
+    Returns the cached session for the given expiry, constructed on first use and shared by subsequent downloads
+    so the SQLite cache is only opened once per process.
+    """
+    return requests_cache.CachedSession(
+        cache_name='cache',
+        backend='sqlite',
+        expire_after=datetime.timedelta(days=cache_days)
+    )
+
+
 class Ticker:
     """Class for fetcing data from Yahoo Finance."""
     def get_historical_data(ticker, start_date="2023-01-01", end_date="2023-08-01", cache_data=True, cache_days=1):
@@ -22,15 +36,7 @@ class Ticker:
         pandas.DataFrame: DataFrame containing the historical stock data, or None if an error occurs.
         """
         try:
-            if cache_data:
-                expire_after = datetime.timedelta(days=cache_days)
-                session = requests_cache.CachedSession(
-                    cache_name='cache',
-                    backend='sqlite',
-                    expire_after=expire_after
-                )
-            else:
-                session = None
+            session = _cached_session(cache_days) if cache_data else None
 
             data = yf.download(ticker, start=start_date, end=end_date, session=session)
             return data if not data.empty else None
@@ -67,9 +73,9 @@ class Ticker:
         """
         if data is None or column_name is None:
             return None
-        if column_name not in Ticker.get_columns(data):
+        if column_name not in data.columns:
             return None
-        return data[column_name].iloc[len(data) - 1]
+        return data[column_name].iat[-1]
 
     @staticmethod
     def plot_data(data, ticker, column_name):
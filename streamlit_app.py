@@ -8,12 +8,32 @@ from core.option_pricing.base import OPTION_TYPE
 from core.util.ticker import Ticker
 
 
-@st.cache_data
+# Seconds market data stays cached in the app, matching the one day expiry of the HTTP cache
+DATA_CACHE_TTL = 24 * 60 * 60
+
+# Cached Monte Carlo simulations hold the price paths to plot, so only a bounded number of recent ones are kept
+SIMULATION_CACHE_ENTRIES = 16
+SIMULATION_CACHE_TTL = 60 * 60
+
+
+@st.cache_data(ttl=DATA_CACHE_TTL)
 def get_historical_data(ticker):
     """Get historical data for specified ticker and caching it with the app"""
     return Ticker.get_historical_data(ticker)
 
 
+@st.cache_data(ttl=DATA_CACHE_TTL)
+def get_last_price(ticker):
+    """Get the last adjusted close price for specified ticker and caching it with the app"""
+    return Ticker.get_last_price(get_historical_data(ticker), 'Adj Close')
+
+
+@st.cache_resource
+def warm_up_pricing_kernels():
+    """Compile the JIT pricing kernels (or load them from Numba's on-disk cache) once per server process"""
+    MonteCarloPricing(100.0, 100.0, 30, 0.05, 0.2, 10).simulate_price_paths(num_time_steps=2)
+
+
 class OPTION_PRICING_MODEL(Enum):
     BLACK_SCHOLES = 'Black-Scholes'
     MONTE_CARLO = 'Monte Carlo'
@@ -30,6 +50,9 @@ pricing_method = st.sidebar.radio(
 
 st.subheader(f'Pricing Method: {pricing_method}')
 
+# Today's date, evaluated once per script run
+today = datetime.today().date()
+
 
 def get_common_inputs():
     """Function to get common inputs for all models."""
@@ -39,8 +62,8 @@ def get_common_inputs():
     sigma = st.slider('Volatility (Sigma) (%)', 0.0, 100.0, 20.0)
     exercise_date = st.date_input(
         'Exercise Date',
-        min_value=datetime.today() + timedelta(days=1),
-        value=datetime.today() + timedelta(days=365)
+        min_value=today + timedelta(days=1),
+        value=today + timedelta(days=365)
     )
     return ticker, strike_price, risk_free_rate, sigma, exercise_date
 
@@ -64,25 +87,40 @@ def format_parameters(ticker, exercise_date, risk_free_rate, sigma):
     fig = Ticker.plot_data(data, ticker, 'Adj Close')
     st.pyplot(fig)
 
-    spot_price = Ticker.get_last_price(data, 'Adj Close')
+    spot_price = get_last_price(ticker)
     risk_free_rate /= 100  # Convert percentage to decimal
     sigma /= 100  # Convert percentage to decimal
-    days_to_maturity = (exercise_date - datetime.now().date()).days
+    days_to_maturity = (exercise_date - today).days
 
     return spot_price, days_to_maturity, risk_free_rate, sigma
 
 
+@st.cache_data(max_entries=SIMULATION_CACHE_ENTRIES, ttl=SIMULATION_CACHE_TTL)
+def simulate_option_prices(spot_price, strike_price, days_to_maturity, risk_free_rate, sigma,
+                           number_of_simulations, num_of_movements):
+    """
+    Function to simulate price paths with the Monte Carlo model and price the options from them, cached on its
+    inputs. Pricing reuses the paths rather than drawing separate terminal prices, and only the paths to be
+    plotted are kept, so the figure is built from them outside the cache.
+    """
+    model_instance = MonteCarloPricing(spot_price, strike_price, days_to_maturity, risk_free_rate, sigma,
+                                       number_of_simulations)
+    model_instance.simulate_price_paths(num_time_steps=days_to_maturity)
+    call_option_price = model_instance.calculate_option_price(OPTION_TYPE.CALL_OPTION)
+    put_option_price = model_instance.calculate_option_price(OPTION_TYPE.PUT_OPTION)
+    return model_instance.price_paths[:num_of_movements].copy(), call_option_price, put_option_price
+
+
+@st.cache_data
 def calculate_option_prices(model, spot_price, strike_price, days_to_maturity, risk_free_rate, sigma, *args):
-    """Function to calculate option prices based on the selected model."""
+    """Function to calculate option prices based on the selected model, cached on its inputs."""
     if model == OPTION_PRICING_MODEL.BLACK_SCHOLES.value:
-        model_instance = BlackScholesModel(spot_price, strike_price, days_to_maturity, risk_free_rate, sigma)
+        # Both prices share the same CDF evaluations, so they are calculated together
+        return BlackScholesModel(spot_price, strike_price, days_to_maturity, risk_free_rate, sigma).price_both()
     elif model == OPTION_PRICING_MODEL.MONTE_CARLO.value:
         number_of_simulations = args[0]  # args[0] is number_of_simulations
         model_instance = MonteCarloPricing(spot_price, strike_price, days_to_maturity, risk_free_rate, sigma,
                                            number_of_simulations)
-        model_instance.simulate_price_paths(num_time_steps=days_to_maturity)
-        fig = model_instance.plot_simulation_results(args[1])  # args[1] = num_of_movements
-        st.pyplot(fig)
     elif model == OPTION_PRICING_MODEL.BINOMIAL.value:
         number_of_time_steps = args[0]  # args[0] is number_of_time_steps
         model_instance = BinomialTreeModel(spot_price, strike_price, days_to_maturity, risk_free_rate, sigma,
@@ -95,6 +133,7 @@ def calculate_option_prices(model, spot_price, strike_price, days_to_maturity, r
 
 
 def main():
+    warm_up_pricing_kernels()
     ticker, strike_price, risk_free_rate, sigma, exercise_date = get_common_inputs()
 
     if pricing_method == OPTION_PRICING_MODEL.BLACK_SCHOLES.value:
@@ -126,16 +165,22 @@ def main():
                 spot_price, days_to_maturity, risk_free_rate, sigma = format_parameters(
                     ticker, exercise_date, risk_free_rate, sigma
                 )
-                call_price, put_price = calculate_option_prices(
-                    OPTION_PRICING_MODEL.MONTE_CARLO.value,
-                    spot_price,
-                    strike_price,
-                    days_to_maturity,
-                    risk_free_rate,
-                    sigma,
-                    number_of_simulations,
-                    num_of_movements
-                )
+                if num_of_movements > 0:
+                    price_paths, call_price, put_price = simulate_option_prices(
+                        spot_price, strike_price, days_to_maturity, risk_free_rate, sigma, number_of_simulations,
+                        num_of_movements
+                    )
+                    st.pyplot(MonteCarloPricing.plot_price_paths(price_paths, strike_price))
+                else:
+                    call_price, put_price = calculate_option_prices(
+                        OPTION_PRICING_MODEL.MONTE_CARLO.value,
+                        spot_price,
+                        strike_price,
+                        days_to_maturity,
+                        risk_free_rate,
+                        sigma,
+                        number_of_simulations
+                    )
                 display_option_prices(call_price, put_price)
             except Exception as e:
                 st.error(f"An error occurred: {e}")
@@ -6,7 +6,13 @@ Script testing functionalities of option_pricing package:
 - Testing Monte Carlo Simulation for option pricing   
 """
 
+import math
+import sys
+
+import numpy as np
+
 from core.option_pricing import BlackScholesModel, MonteCarloPricing, BinomialTreeModel
+from core.option_pricing.base import OPTION_TYPE
 from core.util.ticker import Ticker
 
 # Fetching the prices from Yahoo Finance
@@ -17,19 +23,112 @@ Ticker.plot_data(data, 'TSLA', 'Adj Close')
 
 # Black-Scholes model testing
 BSM = BlackScholesModel(100, 100, 365, 0.1, 0.2)
-print(BSM.calculate_option_price('Call Option'))
-print(BSM.calculate_option_price('Put Option'))
+BSM_call = BSM.calculate_option_price(OPTION_TYPE.CALL_OPTION)
+BSM_put = BSM.calculate_option_price(OPTION_TYPE.PUT_OPTION)
+print(BSM_call)
+print(BSM_put)
+print(BSM.price_both())
+
+# Pricing both options at once matches pricing them separately, and satisfies put-call parity
+both_call, both_put = BSM.price_both()
+assert math.isclose(both_call, BSM_call, rel_tol=1e-12) and math.isclose(both_put, BSM_put, rel_tol=1e-12)
+assert math.isclose(both_call - both_put, 100 - 100 * math.exp(-0.1), rel_tol=1e-12)
+
+# Deep in the money, the put keeps the precision of its small tail rather than cancelling to zero or below
+deep_put = BlackScholesModel(100, 10, 365, 0.1, 0.2).calculate_option_price(OPTION_TYPE.PUT_OPTION)
+assert deep_put > 0 and math.isclose(BlackScholesModel(100, 10, 365, 0.1, 0.2).price_both()[1], deep_put, rel_tol=1e-9)
+assert (np.array(BlackScholesModel(np.linspace(50, 300, 5020), 100, 365, 0.1, 0.2).price_both()) >= 0).all()
+
+# With zero volatility the option is worth its discounted intrinsic value on the forward price
+BSM_zero_vol = BlackScholesModel(100, 100, 365, 0.1, 0.0)
+assert math.isclose(BSM_zero_vol.calculate_option_price(OPTION_TYPE.CALL_OPTION), 100 - 100 * math.exp(-0.1))
+assert BSM_zero_vol.calculate_option_price(OPTION_TYPE.PUT_OPTION) == 0.0
+
+# A strike ladder priced in one vectorised call matches pricing each strike as a scalar
+strikes = [80.0, 100.0, 120.0]
+ladder_calls, ladder_puts = BlackScholesModel(100, np.array(strikes), 365, 0.1, 0.2).price_both()
+for strike, ladder_call, ladder_put in zip(strikes, ladder_calls, ladder_puts):
+    scalar_call, scalar_put = BlackScholesModel(100, strike, 365, 0.1, 0.2).price_both()
+    assert math.isclose(ladder_call, scalar_call, rel_tol=1e-12) and math.isclose(ladder_put, scalar_put, rel_tol=1e-12)
 
 # Binomial model testing
 BOPM = BinomialTreeModel(100, 100, 365, 0.1, 0.2, 15000)
-print(BOPM.calculate_option_price('Call Option'))
-print(BOPM.calculate_option_price('Put Option'))
+print(BOPM.calculate_option_price(OPTION_TYPE.CALL_OPTION))
+print(BOPM.calculate_option_price(OPTION_TYPE.PUT_OPTION))
+
+# The closed-form sum over terminal nodes matches backward induction through the tree
+for S, K, N in [(100, 100, 7), (100, 100, 500), (80, 100, 250), (120, 100, 1001)]:
+    BOPM_small = BinomialTreeModel(S, K, 365, 0.1, 0.2, N)
+    j = np.arange(N + 1)
+    S_T = S * BOPM_small.u ** (N - j) * BOPM_small.d ** j
+    for option_type, V in [(OPTION_TYPE.CALL_OPTION, np.maximum(S_T - K, 0.0)),
+                           (OPTION_TYPE.PUT_OPTION, np.maximum(K - S_T, 0.0))]:
+        for _ in range(N):
+            V = math.exp(-0.1 * BOPM_small.dT) * (BOPM_small.p * V[:-1] + BOPM_small.q * V[1:])
+        assert math.isclose(BOPM_small.calculate_option_price(option_type), V[0], rel_tol=1e-10)
+
+# Degenerate trees are rejected rather than priced as NaN
+for degenerate_inputs in [(100, 100, 365, 0.1, 0.0, 1000), (100, 100, 365, 0.1, 0.0005, 1000),
+                          (100, 100, 365, 1.0, 0.01, 1000)]:
+    try:
+        BinomialTreeModel(*degenerate_inputs)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError(f'Degenerate binomial tree {degenerate_inputs} was not rejected')
 
 # Monte Carlo simulation testing
 MC = MonteCarloPricing(100, 100, 365, 0.1, 0.2, 10000)
-MC.simulate_prices()
-print(MC.calculate_option_price('Call Option'))
-print(MC.calculate_option_price('Put Option'))
+MC.simulate_terminal_prices()
+print(MC.calculate_option_price(OPTION_TYPE.CALL_OPTION))
+print(MC.calculate_option_price(OPTION_TYPE.PUT_OPTION))
+
+# The antithetic and control variate estimator converges to the Black-Scholes prices. As the control variate
+# coefficients of a call and a put differ by exactly one, the estimates also satisfy put-call parity exactly.
+MC_reduced = MonteCarloPricing(100, 100, 365, 0.1, 0.2, 100000)
+MC_call = MC_reduced.calculate_option_price(OPTION_TYPE.CALL_OPTION)
+MC_put = MC_reduced.calculate_option_price(OPTION_TYPE.PUT_OPTION)
+assert abs(MC_call - BSM_call) < 0.02 and abs(MC_put - BSM_put) < 0.02
+assert math.isclose(MC_call - MC_put, 100 - 100 * math.exp(-0.1), rel_tol=1e-9)
+
+# Once price paths are simulated, options are priced from their last step without drawing terminal prices
+MC_paths = MonteCarloPricing(100, 100, 365, 0.1, 0.2, 100000)
+MC_paths.simulate_price_paths(num_time_steps=12)
+paths_call = MC_paths.calculate_option_price(OPTION_TYPE.CALL_OPTION)
+paths_put = MC_paths.calculate_option_price(OPTION_TYPE.PUT_OPTION)
+assert not hasattr(MC_paths, 'Z')
+assert abs(paths_call - BSM_call) < 0.1 and abs(paths_put - BSM_put) < 0.1
+assert math.isclose(paths_call - paths_put, 100 - 100 * math.exp(-0.1), rel_tol=1e-9)
+
+# Without Numba, the NumPy fallback simulates the same paths in the same single precision
+MonteCarloSimulation = sys.modules[MonteCarloPricing.__module__]
+if MonteCarloSimulation.gbm_paths is not None:
+    kernel_paths = MonteCarloPricing(100, 100, 365, 0.1, 0.2, 1000)
+    kernel_paths.simulate_price_paths(num_time_steps=365)
+    gbm_paths, MonteCarloSimulation.gbm_paths = MonteCarloSimulation.gbm_paths, None
+    numpy_paths = MonteCarloPricing(100, 100, 365, 0.1, 0.2, 1000)
+    numpy_paths.simulate_price_paths(num_time_steps=365)
+    MonteCarloSimulation.gbm_paths = gbm_paths
+    assert numpy_paths.price_paths.dtype == kernel_paths.price_paths.dtype == MonteCarloSimulation.PATH_DTYPE
+    assert np.allclose(numpy_paths.price_paths, kernel_paths.price_paths, rtol=1e-4)
+
+# On a CUDA device, the reduction kernels sum the same terminal prices and payoffs as the numexpr expressions
+if MonteCarloSimulation._cuda_device_available():
+    import cupy as cp
+    import numexpr as ne
+
+    MC_gpu = MonteCarloPricing(100, 100, 365, 0.1, 0.2, 10000)
+    MC_gpu.simulate_terminal_prices()
+    Z_device = cp.asarray(MC_gpu.Z)
+    local_dict = MC_gpu._local_dict(Z=MC_gpu.Z)
+    terminal_price_sum, payoff_sums = MonteCarloSimulation._gpu_sum_kernels()
+    kernels = [(terminal_price_sum, MonteCarloSimulation.ANTITHETIC_TERMINAL_PRICE_EXPRESSION)]
+    kernels += [(payoff_sums[option_type], expression)
+                for option_type, expression in MonteCarloSimulation.ANTITHETIC_PAYOFF_EXPRESSIONS.items()]
+    for kernel, expression in kernels:
+        gpu_sum = float(kernel(Z_device, *MC_gpu._kernel_args()))
+        assert math.isclose(gpu_sum, float(ne.evaluate(f'sum({expression})', local_dict=local_dict)), rel_tol=1e-9)
+
 MC.plot_simulation_results(20)
 
 